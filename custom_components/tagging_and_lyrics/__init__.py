@@ -2,8 +2,9 @@ import logging
 import voluptuous as vol
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers import config_validation as cv
-from .tagging import async_setup_tagging_service
-from .lyrics import async_setup_lyrics_service
+from homeassistant.helpers.start import async_at_start
+from .tagging import async_setup_tagging_service, async_unload_tagging_service
+from .lyrics import async_setup_lyrics_service, async_unload_lyrics_service
 from .const import (
     DOMAIN,
     CONF_MEDIA_PLAYER,
@@ -34,22 +35,19 @@ async def async_setup_entry(hass: HomeAssistant, config_entry) -> bool:
     """Set up the Tagging and Lyrics integration from a config entry."""
     _LOGGER.info("Setting up the Tagging and Lyrics integration from config entry.")
 
-    hass.data[DOMAIN] = config_entry.data
+    hass.data[DOMAIN] = dict(config_entry.data)
 
     # Register the tagging and lyrics services asynchronously
     await async_setup_tagging_service(hass)
     await async_setup_lyrics_service(hass)
 
-    # Ensure logging level is set to debug for troubleshooting
-    logging.getLogger("custom_components.tagging_and_lyrics").setLevel(logging.DEBUG)
-
     # Autostart the fetch_lyrics service
-    async def autostart(event):
+    async def autostart(hass: HomeAssistant):
         _LOGGER.debug("Autostarting fetch_lyrics service.")
         try:
             entity_id = config_entry.data[CONF_MEDIA_PLAYER]  # Use the configured media player
             await hass.services.async_call(
-                "tagging_and_lyrics",
+                DOMAIN,
                 "fetch_lyrics",
                 {"entity_id": entity_id}
             )
@@ -57,8 +55,19 @@ async def async_setup_entry(hass: HomeAssistant, config_entry) -> bool:
         except Exception as e:
             _LOGGER.error("Error in autostarting fetch_lyrics service: %s", e)
 
-    # Listen for Home Assistant start event
-    hass.bus.async_listen_once("homeassistant_start", autostart)
-    _LOGGER.debug("Registered autostart listener for homeassistant_start.")
+    # Run once Home Assistant has started (immediately if it already has, e.g. when the entry is added later)
+    config_entry.async_on_unload(async_at_start(hass, autostart))
+    _LOGGER.debug("Registered autostart for Home Assistant start.")
+
+    return True
+
+async def async_unload_entry(hass: HomeAssistant, config_entry) -> bool:
+    """Unload the Tagging and Lyrics integration and release its runtime state."""
+    _LOGGER.info("Unloading the Tagging and Lyrics integration.")
+
+    await async_unload_tagging_service(hass)
+    await async_unload_lyrics_service(hass)
+
+    hass.data.pop(DOMAIN)
 
     return True
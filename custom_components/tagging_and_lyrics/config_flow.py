@@ -1,9 +1,16 @@
 import voluptuous as vol
 from homeassistant import config_entries
-from homeassistant.core import HomeAssistant
 from homeassistant.helpers import config_validation as cv
 from .const import DOMAIN, CONF_MEDIA_PLAYER, CONF_HOST, CONF_PORT, CONF_ACCESS_KEY, CONF_ACCESS_SECRET
 
+DATA_SCHEMA = vol.Schema({
+    vol.Required(CONF_MEDIA_PLAYER): cv.string,
+    vol.Required(CONF_PORT, default=6056): cv.port,
+    vol.Required(CONF_HOST): cv.string,
+    vol.Required(CONF_ACCESS_KEY): cv.string,
+    vol.Required(CONF_ACCESS_SECRET): cv.string,
+})
+
 class TaggingAndLyricsConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     VERSION = 1
     CONNECTION_CLASS = "local_push"
@@ -12,12 +19,4 @@ class TaggingAndLyricsConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         if user_input is not None:
             return self.async_create_entry(title="Tagging and Lyrics", data=user_input)
 
-        data_schema = vol.Schema({
-            vol.Required(CONF_MEDIA_PLAYER): cv.string,
-            vol.Required(CONF_PORT, default=6056): cv.port,
-            vol.Required(CONF_HOST): cv.string,
-            vol.Required(CONF_ACCESS_KEY): cv.string,
-            vol.Required(CONF_ACCESS_SECRET): cv.string,
-        })
-
-        return self.async_show_form(step_id="user", data_schema=data_schema)
+        return self.async_show_form(step_id="user", data_schema=DATA_SCHEMA)
@@ -1,63 +1,149 @@
 import logging
 import datetime
 import voluptuous as vol
-from homeassistant.core import HomeAssistant, ServiceCall
+from homeassistant.core import HomeAssistant, ServiceCall, callback
 from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.event import async_track_state_change_event
+from homeassistant.util import dt as dt_util
 import lrc_kit
-import time
+import requests
+from requests.adapters import HTTPAdapter
 import re
+import bisect
+from array import array
 import asyncio
-import aiohttp
+from collections import OrderedDict
+from .const import DOMAIN, CONF_MEDIA_PLAYER
 
 _LOGGER = logging.getLogger(__name__)
 
-# Global variable to store last processed media content ID
-LAST_MEDIA_CONTENT_ID = None
-ACTIVE_LYRICS_LOOP = None  # mananges the situation where new lyrics are requested when some are still playing - important for radio streams where tracks get cut short
-KILL_LYRICS = False
+# Providers searched for lyrics, in order
+LYRICS_PROVIDERS = [lrc_kit.QQProvider]
+
+# Connections kept alive per host by the HTTP session shared by the lyrics providers
+LYRICS_HTTP_POOL_SIZE = 4
+# Seconds to wait for a provider search before giving up on the track, also the socket timeout of each provider request
+LYRICS_SEARCH_TIMEOUT = 10
+
+# Number of recently found lyrics kept in the lyrics cache
+LYRICS_CACHE_SIZE = 256
+
+# input_text entities showing the previous/current/next line
+LYRICS_INPUT_TEXTS = ("input_text.line1", "input_text.line2", "input_text.line3")
 
 SERVICE_FETCH_LYRICS_SCHEMA = vol.Schema({
     vol.Required("entity_id"): cv.entity_id
 })
 
+# Precompiled patterns used by lyricSplit and clean_track_name
+_TIMESTAMP_PAT = re.compile(r'\[[^\]]+\]')
+_CLEANUP_PAT = re.compile(r'\s*[\(\[].*?[\)\]]|\bfrom\s+(?:".+?"|.+?)\s+soundtrack\b', re.IGNORECASE)
+_HYPHEN_PAT = re.compile(r'\s*-\s*')
+_CHINESE_PAT = re.compile(r'[\u4e00-\u9fff]+')
+# Normalises special quotes/apostrophes
+_QUOTES_TABLE = str.maketrans({"’": "'", "“": '"', "”": '"'})
+
+class _TimeoutHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter that applies LYRICS_SEARCH_TIMEOUT to requests sent without a timeout."""
+
+    def send(self, request, timeout=None, **kwargs):
+        # lrc_kit providers never pass a timeout, which would let a stalled request hold its executor thread forever
+        if timeout is None:
+            timeout = LYRICS_SEARCH_TIMEOUT
+        return super().send(request, timeout=timeout, **kwargs)
+
 def lyricSplit(lyrics):
-    """Split lyrics into a timeline and corresponding lines."""
-    timeline = []
+    """Split lyrics into a timeline (an int64 array of milliseconds) and corresponding lines."""
+    timeline = array('q')
     lrc = []
 
+    in_order = True
+
     for line in lyrics.splitlines():
-        if line.startswith(("[0", "[1", "[2", "[3")):
-            # Match timestamp in square brackets (e.g., [01:15.35])
-            regex = re.compile(r'\[.+?\]')
-            match = re.match(regex, line)
+        if not line.startswith("["):
+            continue
+
+        # Peel off the leading timestamps (e.g., [01:15.35], or [00:29.00][00:44.00] for a repeated line)
+        stamps = []
+        while line.startswith("["):
+            stamp, sep, line = line.partition("]")
+            if not sep:
+                break
+            stamps.append(stamp[1:])
+
+        if "[" in line:
+            line = _TIMESTAMP_PAT.sub('', line)  # Remove any further tags from the line
+        line = line.strip()
+
+        if not line:  # Skip if the line is empty after removing the timestamp (also skips [ti:...] etc.)
+            continue
+
+        for stamp in stamps:
+            minutes, colon, seconds = stamp.partition(":")
+            if not colon or not minutes.isdigit():
+                continue  # Not a timestamp
+
+            # Convert the timestamp to milliseconds using integer math (fraction may be 1-3 digits)
+            seconds, _, fraction = seconds.partition(".")
+            try:
+                milliseconds = (int(minutes) * 60 + int(seconds)) * 1000
+                if fraction:
+                    milliseconds += int(fraction[:3].ljust(3, "0"))
+            except ValueError:
+                _LOGGER.warning("Invalid timestamp format: %s", stamp)
+                continue
 
-            if not match:
-                continue  # Skip lines with no timestamp
+            if timeline and milliseconds < timeline[-1]:
+                in_order = False
+            timeline.append(milliseconds)
+            lrc.append(line)
 
-            # Extract and clean the timestamp
-            _time = match.group(0)[1:-1]  # Remove square brackets
-            line = regex.sub('', line).strip()  # Remove timestamp from the line
+    # Repeated lines put timestamps out of order; the timeline must be sorted for bisect
+    if not in_order:
+        return _sort_timeline(timeline, lrc)
 
-            if not line:  # Skip if the line is empty after removing the timestamp
-                continue
+    return timeline, lrc
 
-            # Convert the timestamp to milliseconds
-            try:
-                time_parts = _time.split(':')
-                minutes = int(time_parts[0])
-                seconds = float(time_parts[1])
-                milliseconds = int((minutes * 60 + seconds) * 1000)
-
-                timeline.append(milliseconds)
-                lrc.append(line)
-            except (ValueError, IndexError) as e:
-                _LOGGER.warning("Invalid timestamp format: %s", _time)
-                continue
+def lyricLinesSplit(lines):
+    """Split lrc_kit's already parsed LyricLine objects into a timeline and corresponding lines."""
+    timeline = array('q')
+    lrc = []
+    in_order = True
+
+    for line in lines:
+        text = line.text.strip()
+        if not text:
+            continue
+
+        milliseconds = line.time_millis
+        if timeline and milliseconds < timeline[-1]:
+            in_order = False
+        timeline.append(milliseconds)
+        lrc.append(text)
+
+    if not in_order:
+        return _sort_timeline(timeline, lrc)
 
     return timeline, lrc
 
+def _sort_timeline(timeline, lrc):
+    """Sort a timeline and its lines by timestamp."""
+    pairs = sorted(zip(timeline, lrc), key=lambda pair: pair[0])
+    return array('q', (ms for ms, _ in pairs)), [text for _, text in pairs]
+
+def _dedup_timeline(timeline, lrc):
+    """Merge adjacent identical lines, keeping the earliest timestamp of each run."""
+    deduped_timeline = array('q')
+    deduped_lrc = []
+    for ms, text in zip(timeline, lrc):
+        if deduped_lrc and text == deduped_lrc[-1]:
+            continue
+        deduped_timeline.append(ms)
+        deduped_lrc.append(text)
+    return deduped_timeline, deduped_lrc
+
 def calculate_media_timecode(pos, updated):
-    """Calculate the current media position."""
+    """Calculate the current media position in integer milliseconds (updated may be a datetime or ISO string)."""
     if pos is None or updated is None:
         return 0
 
@@ -70,46 +156,52 @@ def calculate_media_timecode(pos, updated):
             _LOGGER.error("Calc timecode:Error parsing updated_at timestamp: %s", updated)
             return 0
 
-    current_time = datetime.datetime.now(datetime.timezone.utc)
+    current_time = dt_util.utcnow()
     elapsed_time = (current_time - last_update_time).total_seconds()
-    return round(pos + elapsed_time, 2)
+    return round((pos + elapsed_time) * 1000)
 
 async def update_lyrics_input_text(hass: HomeAssistant, previous_line: str, current_line: str, next_line: str):
-    """Update the input_text entities with the current lyrics lines."""
-    await hass.services.async_call("input_text", "set_value", {"entity_id": "input_text.line1", "value": previous_line})
-    await hass.services.async_call("input_text", "set_value", {"entity_id": "input_text.line2", "value": current_line})
-    await hass.services.async_call("input_text", "set_value", {"entity_id": "input_text.line3", "value": next_line})
+    """Update the input_text entities with the current lyrics lines, skipping lines that are already shown."""
+    calls = []
+    for entity_id, value in zip(LYRICS_INPUT_TEXTS, (previous_line, current_line, next_line)):
+        state = hass.states.get(entity_id)
+        if state is not None and state.state == value:
+            continue
+        calls.append(hass.services.async_call("input_text", "set_value", {"entity_id": entity_id, "value": value}, blocking=False))
+
+    # Dispatch the changed lines concurrently rather than one after another
+    if calls:
+        await asyncio.gather(*calls)
+
+def stop_lyrics_session(hass: HomeAssistant):
+    """Cancel the running lyrics session. Returns True if one was running."""
+    task = hass.data[DOMAIN]["lyrics"]["task"]
+    if task is None or task.done():
+        return False
+    task.cancel()
+    return True
 
 def clean_track_name(track):
     """Clean up the track name by removing unwanted text, special characters, and comments."""
 
     # 1. Remove text inside parentheses or brackets (e.g., "(single version)", "[remastered]")
-    track = re.sub(r'\s*[\(\[].*?[\)\]]', '', track)
+    #    and phrases like 'From "..." Soundtrack' in a single pass
+    if "(" in track or "[" in track or "soundtrack" in track.lower():
+        track = _CLEANUP_PAT.sub('', track)
 
     # 2. Remove text after a hyphen (e.g., " - From ...")
-    track = re.split(r'\s*-\s*', track)[0]
-
-    # 3. Remove phrases like 'From "..." Soundtrack'
-    track = re.sub(r'\bfrom\s+".+?"\s+soundtrack\b', '', track, flags=re.IGNORECASE)
-    track = re.sub(r'\bfrom\s+.+?\s+soundtrack\b', '', track, flags=re.IGNORECASE)
-    track = re.sub(r'\s+\(album version\)\b', '', track, flags=re.IGNORECASE)
-    track = re.sub(r'\s+\(single version\)\b', '', track, flags=re.IGNORECASE)
-    track = re.sub(r'\s+\(remaster\)\b', '', track, flags=re.IGNORECASE)
-    track = re.sub(r'\s+\(radio edit\)\b', '', track, flags=re.IGNORECASE)
-    track = re.sub(r'\s+\(remix\)\b', '', track, flags=re.IGNORECASE)
-    track = re.sub(r'\s+\(edit\)\b', '', track, flags=re.IGNORECASE)
+    if "-" in track:
+        track = _HYPHEN_PAT.split(track, 1)[0]
 
-    # 4. Remove Chinese characters
-    track = re.sub(r'[\u4e00-\u9fff]+', '', track)
+    # 3. Remove Chinese characters and replace special quotes/apostrophes (none of which are ASCII)
+    if not track.isascii():
+        track = _CHINESE_PAT.sub('', track).translate(_QUOTES_TABLE)
 
-    # 5. Replace special quotes/apostrophes
-    track = track.replace("’", "'").replace("“", '"').replace("”", '"')
-
-    # 6. Trim whitespace
+    # 4. Trim whitespace
     return track.strip()
 
 ## Called from tagging.py ##
-async def trigger_lyrics_lookup(hass: HomeAssistant, title: str, artist: str, play_offset_ms: int, process_begin: str):
+async def trigger_lyrics_lookup(hass: HomeAssistant, title: str, artist: str, play_offset_ms: int, process_begin: datetime.datetime):
     """Trigger lyrics lookup based on a recognized song."""
 
     if not title or not artist:
@@ -119,9 +211,10 @@ async def trigger_lyrics_lookup(hass: HomeAssistant, title: str, artist: str, pl
     _LOGGER.info("Trigger Lyrics (from tagging) -> Artist: %s Title: %s", artist, title)
 
      # Get the configured media player entity ID
-    media_player = hass.data["tagging_and_lyrics"]["media_player"]
+    media_player = hass.data[DOMAIN][CONF_MEDIA_PLAYER]
 
-    await fetch_lyrics_for_track(hass, title, artist, play_offset_ms/1000, process_begin, media_player, True) #fingerprinting is true
+    # Run the session as its own task so it can be cancelled without cancelling the tagging service call
+    hass.async_create_task(fetch_lyrics_for_track(hass, title, artist, play_offset_ms/1000, process_begin, media_player, True)) #fingerprinting is true
 
 def get_media_player_info(hass: HomeAssistant, entity_id: str):
     """Retrieve track, artist, media position, and last update time from media player."""
@@ -152,184 +245,214 @@ def get_media_player_info(hass: HomeAssistant, entity_id: str):
 
     return track, artist, pos, updated_at
 
-async def fetch_lyrics_for_track(hass: HomeAssistant, track: str, artist: str, pos, updated_at, entity_id, audiofingerprint):
-    """Fetch lyrics for a given track and synchronize with playback."""
-    global ACTIVE_LYRICS_LOOP
-    global KILL_LYRICS
+async def wait_for_resume(hass: HomeAssistant, entity_id):
+    """Wait until the media player leaves the paused state."""
+    resumed = asyncio.Event()
+
+    @callback
+    def state_changed(event):
+        new_state = event.data.get("new_state")
+        if new_state is None or new_state.state != "paused":
+            resumed.set()
+
+    unsub = async_track_state_change_event(hass, [entity_id], state_changed)
+    try:
+        # The player may have resumed before the listener was registered
+        player_state = hass.states.get(entity_id)
+        if player_state is not None and player_state.state == "paused":
+            await resumed.wait()
+    finally:
+        unsub()
+
+def _search_and_split(provider, search_request):
+    """Run the blocking provider search and split the result into (timeline, lrc) in one executor job."""
+    lyrics_result = provider.search(search_request)
 
-    _LOGGER.info("Fetch: Fetching lyrics for: %s %s", artist, track)
-    _LOGGER.info("Fetch: pos=%s, updated_at=%s", pos, updated_at)
+    if not lyrics_result:
+        return None
 
-    # Ensure they are valid
-    if pos is None or updated_at is None:
-        _LOGGER.error("Fetch: pos or updated_at is not initialized. Exiting lyrics sync. Setting KILL_LYRICS")
-        ACTIVE_LYRICS_LOOP = None 
-        KILL_LYRICS = True
+    _LOGGER.debug("Fetch: Processing lyrics into timeline")
+    # lrc_kit returns a Lyrics object whose lines are already parsed; only fall back to re-parsing its text
+    lines = getattr(lyrics_result, "lyrics", None)
+    if isinstance(lines, list):
+        timeline, lrc = lyricLinesSplit(lines)
+    else:
+        timeline, lrc = lyricSplit(str(lyrics_result))
 
-    # Check if the switch is enabled
-    if not hass.states.is_state("input_boolean.lyrics_enable", "on"):
-        _LOGGER.info("Fetch: Lyrics fetching is disabled by switch. Exiting.")
-        return
+    # A repeated line would redraw an identical display, so each run of them is shown once
+    return _dedup_timeline(timeline, lrc)
 
-    # Check the media_content_id for special cases
-    media_content_id = hass.states.get(entity_id).attributes.get("media_content_id", "")
-    
-    _LOGGER.info("Fetch: Start new session")
-    await update_lyrics_input_text(hass, "", "", "")
-    # Start new session
-
-    timeout = 5
-    interval = 0.1
-    elapsed = 0
-
-    if KILL_LYRICS:
-        while ACTIVE_LYRICS_LOOP:
-            if elapsed >= timeout:
-                _LOGGER.info("Timeout: Lyrics session did not terminate within 5 seconds.")
-                _LOGGER.info("KILL_LYRICS: %s, ACTIVE_LOOP_LYRICS: %s", KILL_LYRICS, ACTIVE_LYRICS_LOOP)
-                #return
-                ACTIVE_LYRICS_LOOP = None # not sure why it's not clearing.  Force it cleared and see what happens :-)
-                _LOGGER.info("KILL_LYRICS - forced: %s, ACTIVE_LOOP_LYRICS: %s", KILL_LYRICS, ACTIVE_LYRICS_LOOP)
-            await asyncio.sleep(interval)
-            elapsed += interval
-
-    KILL_LYRICS = False
-
-    _LOGGER.info("Fetch: ACTIVE_LYRICS_LOOP = **TRUE**.")
-    ACTIVE_LYRICS_LOOP = True
-    timeline = []
-    lrc = []
+async def search_lyrics(hass: HomeAssistant, track: str, artist: str):
+    """Search for lyrics and split them into (timeline, lrc), reusing recently found tracks."""
+    runtime = hass.data[DOMAIN]["lyrics"]
+    cache = runtime["cache"]
+    key = (artist.strip().casefold(), track.strip().casefold())
+    cached = cache.get(key)
+    if cached is not None:
+        _LOGGER.info("Fetch: Using cached lyrics.")
+        cache.move_to_end(key)
+        return cached
 
-    # Load lyrics
-    lyrics_provider = [lrc_kit.QQProvider]
-    provider = lrc_kit.ComboLyricsProvider(lyrics_provider)
+    provider = runtime["provider"]
 
     _LOGGER.info("Fetch: Searching for lyrics.")
-    search_request = await hass.async_add_executor_job(lrc_kit.SearchRequest, artist, track)
-    lyrics_result = await hass.async_add_executor_job(provider.search, search_request)
+    # Building the request is plain object construction; only the search itself blocks
+    search_request = lrc_kit.SearchRequest(artist, track)
+    try:
+        lyrics = await asyncio.wait_for(
+            hass.async_add_executor_job(_search_and_split, provider, search_request), LYRICS_SEARCH_TIMEOUT
+        )
+    except asyncio.TimeoutError:
+        # Backstop only: the executor thread keeps running until the provider's request hits its socket timeout
+        _LOGGER.warning("Fetch: Lyrics search timed out after %s seconds.", LYRICS_SEARCH_TIMEOUT)
+        return None
+
+    if lyrics is None:
+        return None
+
+    # Lyrics for a track don't change, so entries are only evicted by size
+    cache[key] = lyrics
+    if len(cache) > LYRICS_CACHE_SIZE:
+        cache.popitem(last=False)
+    return lyrics
 
-    if not lyrics_result:
+async def fetch_lyrics_for_track(hass: HomeAssistant, track: str, artist: str, pos, updated_at, entity_id, audiofingerprint):
+    """Fetch lyrics for a given track and synchronize with playback."""
+    _LOGGER.info("Fetch: Fetching lyrics for: %s %s (pos=%s, updated_at=%s)", artist, track, pos, updated_at)
+
+    # Ensure they are valid
+    if pos is None or updated_at is None:
+        _LOGGER.error("Fetch: pos or updated_at is not initialized.")
+
+    # A new request always replaces the running session; register this one straight away so a
+    # request arriving while we wait below cancels this session rather than the old one
+    runtime = hass.data[DOMAIN]["lyrics"]
+    previous_task = runtime["task"]
+    stop_lyrics_session(hass)
+    task = asyncio.current_task()
+    runtime["task"] = task
+
+    try:
+        # Check if the switch is enabled
+        if not hass.states.is_state("input_boolean.lyrics_enable", "on"):
+            _LOGGER.info("Fetch: Lyrics fetching is disabled by switch. Exiting.")
+            return
+
+        await update_lyrics_input_text(hass, "", "", "")
+
+        # Let the cancelled session finish clearing the display before this one starts
+        if previous_task is not None and not previous_task.done():
+            await asyncio.wait({previous_task}, timeout=5)
+
+        _LOGGER.info("Fetch: Lyrics session started.")
+        await _run_lyrics_session(hass, track, artist, pos, updated_at, entity_id)
+    except asyncio.CancelledError:
+        _LOGGER.info("Fetch: Lyrics session cancelled.")
+        await update_lyrics_input_text(hass, "", "", "")
+        raise
+    finally:
+        # Only clear the session if a newer one has not already replaced it
+        if runtime["task"] is task:
+            runtime["task"] = None
+        _LOGGER.info("Fetch: Lyrics session ended.")
+
+async def _run_lyrics_session(hass: HomeAssistant, track: str, artist: str, pos, updated_at, entity_id):
+    """Search for lyrics and display them in sync with playback until finished; runs until cancelled otherwise."""
+    lyrics = await search_lyrics(hass, track, artist)
+
+    if lyrics is None:
         _LOGGER.warning("Fetch: No lyrics found for '%s'.", track)
         #update_lyrics_input_text(hass, "No lyrics found", "", "")
         await update_lyrics_input_text(hass, "", "", "")
         return
 
-    _LOGGER.warning("Fetch: Processing lyrics into timeline")
-    timeline, lrc = lyricSplit(str(lyrics_result))
+    timeline, lrc = lyrics
 
     if not timeline:
         _LOGGER.error("Fetch: Lyrics have no timeline.")
         await update_lyrics_input_text(hass, "Lyrics not synced", "", "")
         return
 
-    last_media = media_content_id
+    # Anchor the media position to the event loop's monotonic clock once; each tick then only needs a clock read
+    loop = hass.loop
+    start_pos_ms = calculate_media_timecode(pos, updated_at)
+    start_time = loop.time()
+    shown = 0  # Line index currently on display (0 = none)
 
-    while ACTIVE_LYRICS_LOOP:  
-        player_state = hass.states.get(entity_id).state
+    while True:
+        player_state = hass.states.get(entity_id)
+        if player_state is None:
+            _LOGGER.error("Fetch: Media player entity not found. Exiting lyrics session.")
+            break
 
         # Check if media player is paused
-        if player_state == "paused":
+        if player_state.state == "paused":
             _LOGGER.info("Fetch: Media player paused. Clearing lyrics display.")
             await update_lyrics_input_text(hass, "", "", "")
 
-            pause_start = datetime.datetime.now(datetime.timezone.utc)
-            while hass.states.get(entity_id).state == "paused":
-                #time.sleep(1)
-                await asyncio.sleep(1)
+            pause_start = loop.time()
+            await wait_for_resume(hass, entity_id)
 
-            pause_end = datetime.datetime.now(datetime.timezone.utc)
-            pause_duration = (pause_end - pause_start).total_seconds()
+            pause_duration = loop.time() - pause_start
             _LOGGER.info("Fetch: Media player resumed. Adjusting updated_at by %s seconds.", pause_duration)
-
-            if isinstance(updated_at, str):
-                updated_at = datetime.datetime.fromisoformat(updated_at)
-
-            updated_at += datetime.timedelta(seconds=pause_duration)
-
-        media_content_id = hass.states.get(entity_id).attributes.get("media_content_id", "")
+            start_time += pause_duration
+            shown = 0  # The display was cleared while paused
 
         # Calculate media timecode
-        media_timecode = calculate_media_timecode(pos, updated_at)
+        media_timecode_ms = start_pos_ms + int((loop.time() - start_time) * 1000)
 
-        if media_timecode * 1000 >= timeline[-1]:  # Exit if lyrics finished
-            _LOGGER.info("Fetch: Lyrics finished, ***EXITING ACTIVE_LYRICS_LOOP***")
+        if media_timecode_ms >= timeline[-1]:  # Exit if lyrics finished
+            _LOGGER.info("Fetch: Lyrics finished, exiting lyrics session.")
             await update_lyrics_input_text(hass, "", "", "")
-            ACTIVE_LYRICS_LOOP = None
-            KILL_LYRICS = False
             break
 
         # Display synchronized lyrics
-        if timeline:
-            for n in range(1, len(timeline)):
-                if timeline[n - 1] <= media_timecode * 1000 <= timeline[n]:
-                    previous_line = lrc[n - 2] if n > 1 else ""
-                    current_line = lrc[n - 1]
-                    next_line = lrc[n] if n < len(lrc) else ""
-
-                    await update_lyrics_input_text(hass, previous_line, current_line, next_line)
-
-                    sleep_time = (timeline[n] - media_timecode * 1000) / 1000.0
-                    total_sleep = max(0.1, sleep_time)  # Ensure minimum sleep time
-                    interval = 0.1  # Check every 0.1 seconds
-
-                    while total_sleep > 0:
-                        #if not ACTIVE_LYRICS_LOOP:  # Check if loop should exit
-                        if KILL_LYRICS == True:
-                            _LOGGER.info("Fetch: Lyrics loop interrupted (set to None), exiting sleep.")
-                            await update_lyrics_input_text(hass, "", "", "")
-                            ACTIVE_LYRICS_LOOP = None
-                            KILL_LYRICS = False
-                            break  # Exit the async function immediately
-                        
-                        #time.sleep(min(interval, total_sleep))  # Sleep for interval or remaining time
-                        await asyncio.sleep(min(0.1, total_sleep))
-                        total_sleep -= interval  # Reduce remaining sleep time
+        n = bisect.bisect_right(timeline, media_timecode_ms)  # timeline[n - 1] <= timecode < timeline[n]
+        if n > 0 and n != shown:
+            shown = n
+            previous_line = lrc[n - 2] if n > 1 else ""
+            current_line = lrc[n - 1]
+            next_line = lrc[n] if n < len(lrc) else ""
 
-    #get more lyrics if the mediaplayer is continuing (but not when it's streaming radio...)
-    _LOGGER.info("Fetch: Lyrics sync loop ended.")
-    
-    # Reset ACTIVE_LYRICS_LOOP to None when loop exits
-    _LOGGER.info("Fetch: ACTIVE_LYRICS_LOOP = None.")
-    ACTIVE_LYRICS_LOOP = None
+            await update_lyrics_input_text(hass, previous_line, current_line, next_line)
 
+        # Always positive: bisect_right guarantees timeline[n] > media_timecode_ms
+        sleep_time = (timeline[n] - media_timecode_ms) / 1000.0
 
+        # Sleep until the next line is due; stop_lyrics_session cancels the sleep immediately
+        await asyncio.sleep(sleep_time)
 
-def handle_fetch_lyrics(hass: HomeAssistant, call: ServiceCall):
+    #get more lyrics if the mediaplayer is continuing (but not when it's streaming radio...)
+
+async def handle_fetch_lyrics(hass: HomeAssistant, call: ServiceCall):
     """Main service handler: gets media info and fetches lyrics."""
     entity_id = call.data.get("entity_id")
     
     # Stop any current session cleanly
-    global ACTIVE_LYRICS_LOOP
-    global KILL_LYRICS
-
-    if ACTIVE_LYRICS_LOOP:
-        #_LOGGER.warning("Handle Fetch Lyrics:Stopping current lyrics session for new request. Setting ACTIVE_LYRICS_LOOP = None.")
-        _LOGGER.warning("Handle Fetch Lyrics:Stopping current lyrics session for new request. Setting KILL_LYRICS")
-        #ACTIVE_LYRICS_LOOP = None
-        KILL_LYRICS = True
+    if stop_lyrics_session(hass):
+        _LOGGER.warning("Handle Fetch Lyrics:Stopping current lyrics session for new request.")
 
     async def monitor_playback(entity, old_state, new_state):
         """Monitor media player state changes."""
-        global LAST_MEDIA_CONTENT_ID
-        global ACTIVE_LYRICS_LOOP
-        global KILL_LYRICS
+        runtime = hass.data[DOMAIN]["lyrics"]
 
-        _LOGGER.debug("Monitor Playback: Media player state changed: %s -> %s", old_state.state if old_state else "None", new_state.state)
+        debug = _LOGGER.isEnabledFor(logging.DEBUG)
+        if debug:
+            _LOGGER.debug("Monitor Playback: Media player state changed: %s -> %s", old_state.state if old_state else "None", new_state.state)
 
-        media_content_id = hass.states.get(entity).attributes.get("media_content_id", "")
+        media_content_id = new_state.attributes.get("media_content_id", "")
         
         # Only act if the player changes to 'playing' and it's not a radio station
         if new_state.state == "playing" and not media_content_id.startswith("library://radio"):
             
-            _LOGGER.debug("Monitor Playback: LAST_MEDIA_CONTENT_ID: %s", LAST_MEDIA_CONTENT_ID)
-            _LOGGER.debug("Monitor Playback: media_content_id: %s", media_content_id)
+            if debug:
+                _LOGGER.debug("Monitor Playback: last_media_content_id: %s", runtime["last_media_content_id"])
+                _LOGGER.debug("Monitor Playback: media_content_id: %s", media_content_id)
 
             # Check if the media_content_id is different from the last one processed
-            if media_content_id and media_content_id != LAST_MEDIA_CONTENT_ID:
-                #_LOGGER.info("Monitor Playback: Content has changed, not a radio station. Setting ACTIVE_LYRICS_LOOP = None")
-                _LOGGER.info("Monitor Playback: Content has changed, not a radio station. Setting KILL_LYRICS")
-                #ACTIVE_LYRICS_LOOP = None # changed from False
-                KILL_LYRICS = True
+            if media_content_id and media_content_id != runtime["last_media_content_id"]:
+                _LOGGER.info("Monitor Playback: Content has changed, not a radio station. Stopping lyrics session")
+                stop_lyrics_session(hass)
                 await update_lyrics_input_text(hass, "", "", "")
                 track, artist, pos, updated_at = get_media_player_info(hass, entity)
                 _LOGGER.info("Monitor Playback: New Info -> Artist %s, Track %s, media_content_id %s", artist, track, media_content_id)
@@ -337,44 +460,92 @@ def handle_fetch_lyrics(hass: HomeAssistant, call: ServiceCall):
                 # Call the lyrics function and update the last processed ID
                 if track and artist:
                     _LOGGER.debug("Monitor Playback: Fetching>>>>>>>>>>")
-                    LAST_MEDIA_CONTENT_ID = media_content_id
-                    hass.loop.call_soon_threadsafe(hass.async_create_task, fetch_lyrics_for_track(hass, track, artist, 0, updated_at, entity, False))
+                    runtime["last_media_content_id"] = media_content_id
+                    hass.async_create_task(fetch_lyrics_for_track(hass, track, artist, 0, updated_at, entity, False))
             else:
-                _LOGGER.info("Monitor Playback: Track already processed (last media and media match). Skipping lyrics fetch.")
+                _LOGGER.debug("Monitor Playback: Track already processed (last media and media match). Skipping lyrics fetch.")
         #Playing, radio
         elif new_state.state=="playing" and media_content_id.startswith("library://radio"):
-            LAST_MEDIA_CONTENT_ID = media_content_id #it's a radio station so capture the change of stream but don't fetch lyrics
-            #_LOGGER.info("Monitor Playback: Radio station detected.  Setting ACTIVE_LYRICS_LOOP = None")
-            _LOGGER.info("Monitor Playback: Radio station detected.  Setting KILL_LYRICS")
-            #ACTIVE_LYRICS_LOOP = None
-            KILL_LYRICS = True
+            runtime["last_media_content_id"] = media_content_id #it's a radio station so capture the change of stream but don't fetch lyrics
+            _LOGGER.info("Monitor Playback: Radio station detected.  Stopping lyrics session")
+            stop_lyrics_session(hass)
             await update_lyrics_input_text(hass, "", "", "")
         else:
             #not playing
-            #if ACTIVE_LYRICS_LOOP is not None:
-            #    _LOGGER.info("Monitor Playback: Lyrics stopped (media player is not playing). Setting ACTIVE_LYRICS_LOOP = None")
-            #    await update_lyrics_input_text(hass, "", "", "")
-            #ACTIVE_LYRICS_LOOP = None
             await update_lyrics_input_text(hass, "", "", "")
-            _LOGGER.info("Monitor Playback: Media player is not playing - but do nothing about it.")
-
-
-    # Register listener for state changes
-    hass.helpers.event.async_track_state_change(entity_id, monitor_playback)
+            _LOGGER.debug("Monitor Playback: Media player is not playing - but do nothing about it.")
+
+
+    @callback
+    def state_changed(event):
+        """Filter state change events so only state or media changes schedule monitor_playback."""
+        new_state = event.data.get("new_state")
+        if new_state is None:
+            return
+        old_state = event.data.get("old_state")
+        media_content_id = new_state.attributes.get("media_content_id", "")
+        if (old_state is not None and old_state.state == new_state.state
+                and old_state.attributes.get("media_content_id") == media_content_id):
+            return  # Only other attributes (e.g. media position) changed
+        if (new_state.state == "playing" and media_content_id == hass.data[DOMAIN]["lyrics"]["last_media_content_id"]
+                and not media_content_id.startswith("library://radio")):
+            return  # Track already processed, e.g. resuming from pause
+        hass.async_create_task(monitor_playback(event.data["entity_id"], old_state, new_state))
+
+    # Register listener for state changes, replacing any from an earlier call for this entity
+    unsub_listeners = hass.data[DOMAIN]["lyrics"]["unsub_listeners"]
+    unsub = unsub_listeners.pop(entity_id, None)
+    if unsub is not None:
+        unsub()
+    unsub_listeners[entity_id] = async_track_state_change_event(hass, [entity_id], state_changed)
     _LOGGER.debug("Registered state change listener for: %s", entity_id)
 
 async def async_setup_lyrics_service(hass: HomeAssistant):
     """Register the fetch_lyrics service."""
     _LOGGER.debug("Registering the fetch_lyrics service.")
 
+    # lrc_kit instantiates each provider per search and passes its kwargs through, so a shared
+    # session keeps provider connections alive between tracks instead of a new handshake each time
+    session = requests.Session()
+    adapter = _TimeoutHTTPAdapter(pool_connections=LYRICS_HTTP_POOL_SIZE, pool_maxsize=LYRICS_HTTP_POOL_SIZE)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+
+    # Runtime state of the lyrics service - the running session (important for radio streams where tracks get cut short) and the last processed media content ID
+    hass.data[DOMAIN]["lyrics"] = {
+        "task": None,
+        "last_media_content_id": None,
+        "unsub_listeners": {},
+        "session": session,
+        # Lyrics provider shared by all searches
+        "provider": lrc_kit.ComboLyricsProvider(LYRICS_PROVIDERS, session=session),
+        # Recently found lyrics as (timeline, lrc), keyed by (artist, title) - saves a provider search when a track is replayed
+        "cache": OrderedDict(),
+    }
+
     async def async_wrapper(call):
         await handle_fetch_lyrics(hass, call)
 
     hass.services.async_register(
-        "tagging_and_lyrics",
+        DOMAIN,
         "fetch_lyrics",
         async_wrapper,
         schema=SERVICE_FETCH_LYRICS_SCHEMA
     )
 
-    _LOGGER.info("fetch_lyrics service registered successfully.")
\ No newline at end of file
+    _LOGGER.info("fetch_lyrics service registered successfully.")
+
+async def async_unload_lyrics_service(hass: HomeAssistant):
+    """Stop the running lyrics session and remove the fetch_lyrics service and its listeners."""
+    runtime = hass.data[DOMAIN].pop("lyrics")
+
+    for unsub in runtime["unsub_listeners"].values():
+        unsub()
+
+    task = runtime["task"]
+    if task is not None and not task.done():
+        task.cancel()
+
+    hass.services.async_remove(DOMAIN, "fetch_lyrics")
+
+    runtime["session"].close()
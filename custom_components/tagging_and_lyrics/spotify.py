@@ -1,11 +1,14 @@
-import json
+import asyncio
+import functools
 import logging
 import urllib.parse
+from collections import OrderedDict
 import aiohttp
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers import config_validation as cv
 import voluptuous as vol
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.aiohttp_client import async_create_clientsession, async_get_clientsession
+from homeassistant.helpers.event import async_call_later
 from homeassistant.components.http import HomeAssistantView
 from homeassistant.helpers.storage import Store
 
@@ -29,12 +32,54 @@ SPOTIFY_CONFIG_SCHEMA = vol.Schema({
     vol.Optional("playlist_name", default=DEFAULT_SPOTIFY_PLAYLIST_NAME): cv.string,
 })
 
+# Base URL of the Spotify Web API
+SPOTIFY_API_URL = "https://api.spotify.com"
+
+# Bounds on Spotify requests, and the errors a failed request or unexpected response can raise
+SPOTIFY_TIMEOUT = aiohttp.ClientTimeout(total=15, connect=5)
+SPOTIFY_ERRORS = (aiohttp.ClientError, asyncio.TimeoutError, KeyError, ValueError)
+
+# Seconds before expiry at which the access token is refreshed
+TOKEN_REFRESH_MARGIN = 300
+
+# Playlist tracks are fetched in pages of this size, with at most this many requests in flight
+PLAYLIST_PAGE_SIZE = 100
+PLAYLIST_PAGE_CONCURRENCY = 8
+# Fixed part of the playlist page query string; only the offset varies
+PLAYLIST_PAGE_QUERY = urllib.parse.urlencode({"fields": "items(track(uri))", "limit": PLAYLIST_PAGE_SIZE})
+
+# Search results kept per (title, artist); "not found" results expire after SEARCH_MISS_TTL seconds
+SEARCH_CACHE_SIZE = 512
+SEARCH_MISS_TTL = 3600
+
+# Seconds to wait before writing changed tokens to storage, so quick successive changes are written once
+TOKEN_SAVE_DELAY = 10
+
+# Number of recently added (title, artist) pairs remembered to skip repeated requests, and for how many seconds
+RECENT_ADDS_SIZE = 256
+RECENT_ADDS_TTL = 600
+
 # Schema for the add_to_spotify service call
 SERVICE_ADD_TO_SPOTIFY_SCHEMA = vol.Schema({
     vol.Optional("title"): cv.string,
     vol.Optional("artist"): cv.string,
 })
 
+def _requires_auth(unauthorized_result=None):
+    """Make a SpotifyService method refresh an expiring token first and return unauthorized_result if not authorized."""
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(self, *args, **kwargs):
+            # A token that is still valid needs no refresh (or lock) at all
+            if self.expires_at <= self.hass.loop.time() + TOKEN_REFRESH_MARGIN:
+                await self.refresh_access_token()
+            if not self.authorized:
+                _LOGGER.error("Not authorized with Spotify")
+                return unauthorized_result
+            return await func(self, *args, **kwargs)
+        return wrapper
+    return decorator
+
 class SpotifyAuthView(HomeAssistantView):
     """Handle Spotify authentication callbacks."""
     url = SPOTIFY_AUTH_CALLBACK_PATH
@@ -79,18 +124,34 @@ class SpotifyService:
         self.hass = hass
         self.client_id = config["client_id"]
         self.client_secret = config["client_secret"]
-        self.playlist_id = config.get("playlist_id")
+        self._set_playlist_id(config.get("playlist_id"))
         self.create_playlist = config.get("create_playlist", True)
         self.playlist_name = config.get("playlist_name", DEFAULT_SPOTIFY_PLAYLIST_NAME)
+        # Token requests use the shared session; API requests get their own pool of
+        # kept-alive connections to api.spotify.com (closed by Home Assistant on shutdown)
         self.session = async_get_clientsession(hass)
-        self.user_id = None
+        self.api_session = async_create_clientsession(hass, base_url=SPOTIFY_API_URL, timeout=SPOTIFY_TIMEOUT)
+        self._set_user_id(None)
         self.authorized = False
         
         # Set up storage for tokens
         self.store = Store(hass, SPOTIFY_STORAGE_VERSION, f"{DOMAIN}_{SPOTIFY_STORAGE_KEY}")
-        self.access_token = None
+        self._set_access_token(None)
         self.refresh_token = None
-        self.expires_at = 0
+        self.expires_at = 0.0  # Event loop time at which the access token expires
+        self._refresh_lock = asyncio.Lock()
+        self._refresh_unsub = None
+        
+        # Track URIs in the playlist, the snapshot_id they were fetched at and the ETag of that playlist response
+        self._playlist_uris = None
+        self._playlist_snapshot = None
+        self._playlist_etag = None
+        
+        # Recent search results: (title, artist) -> (expiry or None, (uri, name, artist))
+        self._search_cache = OrderedDict()
+        
+        # (title, artist) requests recently added or found in the playlist: (title, artist) -> (expiry, (name, artist))
+        self._recent_adds = OrderedDict()
     
     async def async_setup(self):
         """Set up the Spotify service."""
@@ -113,25 +174,47 @@ class SpotifyService:
         """Load tokens from storage."""
         data = await self.store.async_load()
         if data:
-            self.access_token = data.get("access_token")
+            self._set_access_token(data.get("access_token"))
             self.refresh_token = data.get("refresh_token")
-            self.expires_at = data.get("expires_at", 0)
-            self.user_id = data.get("user_id")
+            # The saved expiry is on the previous run's loop clock, so treat the token as expired
+            self.expires_at = 0.0
+            self._set_user_id(data.get("user_id"))
             
             # Check if token is still valid or can be refreshed
             if self.refresh_token:
                 return True
         return False
     
-    async def save_tokens(self):
-        """Save tokens to storage."""
-        data = {
+    def save_tokens(self):
+        """Schedule saving the tokens to storage (flushed by Home Assistant on shutdown)."""
+        self.store.async_delay_save(self._token_data, TOKEN_SAVE_DELAY)
+    
+    def _token_data(self):
+        """Return the tokens to save to storage."""
+        return {
             "access_token": self.access_token,
             "refresh_token": self.refresh_token,
             "expires_at": self.expires_at,
             "user_id": self.user_id,
         }
-        await self.store.async_save(data)
+    
+    def _set_access_token(self, access_token):
+        """Set the access token and the request headers that carry it."""
+        self.access_token = access_token
+        self._auth_headers = {"Authorization": f"Bearer {access_token}"}
+        self._auth_headers_json = {**self._auth_headers, "Content-Type": "application/json"}
+    
+    def _set_user_id(self, user_id):
+        """Set the Spotify user ID and the API paths that contain it."""
+        self.user_id = user_id
+        self._url_user_playlists = f"/v1/users/{user_id}/playlists"
+    
+    def _set_playlist_id(self, playlist_id):
+        """Set the playlist ID and the API paths that contain it."""
+        self.playlist_id = playlist_id
+        self._url_playlist_probe = f"/v1/playlists/{playlist_id}?fields=snapshot_id,tracks.total"
+        self._url_playlist_tracks = f"/v1/playlists/{playlist_id}/tracks"
+        self._url_playlist_page = f"{self._url_playlist_tracks}?{PLAYLIST_PAGE_QUERY}&offset="
     
     def get_authorize_url(self):
         """Get the authorization URL for Spotify."""
@@ -160,22 +243,23 @@ class SpotifyService:
         }
         
         try:
-            async with self.session.post("https://accounts.spotify.com/api/token", data=payload) as resp:
+            async with self.session.post("https://accounts.spotify.com/api/token", data=payload, timeout=SPOTIFY_TIMEOUT) as resp:
                 if resp.status != 200:
                     resp_json = await resp.json()
                     _LOGGER.error(f"Failed to exchange code: {resp.status} - {resp_json}")
                     return False
                 
                 tokens = await resp.json()
-                self.access_token = tokens["access_token"]
+                self._set_access_token(tokens["access_token"])
                 self.refresh_token = tokens["refresh_token"]
-                self.expires_at = tokens["expires_in"] + int(self.hass.loop.time())
+                self.expires_at = self.hass.loop.time() + tokens["expires_in"]
+                self._schedule_refresh(tokens["expires_in"])
                 
                 # Get user info
                 await self._fetch_user_info()
                 
                 # Save tokens
-                await self.save_tokens()
+                self.save_tokens()
                 
                 self.authorized = True
                 
@@ -184,19 +268,25 @@ class SpotifyService:
                     await self._create_playlist()
                 
                 return True
-        except Exception as e:
+        except SPOTIFY_ERRORS as e:
             _LOGGER.error(f"Error exchanging code: {e}")
             return False
     
-    async def refresh_access_token(self):
-        """Refresh the access token."""
+    async def refresh_access_token(self, force=False):
+        """Refresh the access token if it is about to expire, or always if forced."""
+        # Concurrent callers wait for one refresh and then find the new token valid
+        async with self._refresh_lock:
+            return await self._refresh_access_token(force)
+    
+    async def _refresh_access_token(self, force):
+        """Refresh the access token while holding the refresh lock."""
         if not self.refresh_token:
             _LOGGER.error("No refresh token available")
             self.authorized = False
             return False
         
         # Check if token is still valid
-        if self.expires_at > int(self.hass.loop.time()) + 300:  # 5 minute margin
+        if not force and self.expires_at > self.hass.loop.time() + TOKEN_REFRESH_MARGIN:
             self.authorized = True
             return True
         
@@ -208,7 +298,7 @@ class SpotifyService:
         }
         
         try:
-            async with self.session.post("https://accounts.spotify.com/api/token", data=payload) as resp:
+            async with self.session.post("https://accounts.spotify.com/api/token", data=payload, timeout=SPOTIFY_TIMEOUT) as resp:
                 if resp.status != 200:
                     resp_json = await resp.json()
                     _LOGGER.error(f"Failed to refresh token: {resp.status} - {resp_json}")
@@ -216,61 +306,74 @@ class SpotifyService:
                     return False
                 
                 tokens = await resp.json()
-                self.access_token = tokens["access_token"]
-                self.expires_at = tokens["expires_in"] + int(self.hass.loop.time())
+                self._set_access_token(tokens["access_token"])
+                self.expires_at = self.hass.loop.time() + tokens["expires_in"]
+                self._schedule_refresh(tokens["expires_in"])
                 
                 # Refresh token might be returned
                 if "refresh_token" in tokens:
                     self.refresh_token = tokens["refresh_token"]
                 
                 # Save tokens
-                await self.save_tokens()
+                self.save_tokens()
                 
                 self.authorized = True
                 return True
-        except Exception as e:
+        except SPOTIFY_ERRORS as e:
             _LOGGER.error(f"Error refreshing token: {e}")
             self.authorized = False
             return False
     
+    def _schedule_refresh(self, expires_in):
+        """Schedule a refresh of the access token shortly before it expires."""
+        if self._refresh_unsub:
+            self._refresh_unsub()
+        self._refresh_unsub = async_call_later(
+            self.hass, max(expires_in - TOKEN_REFRESH_MARGIN, 0), self._scheduled_refresh
+        )
+    
+    async def _scheduled_refresh(self, _now):
+        """Refresh the access token ahead of its expiry."""
+        self._refresh_unsub = None
+        await self.refresh_access_token(force=True)
+    
+    async def _notify(self, title, message, notification_id="spotify_track_status"):
+        """Show a persistent notification."""
+        await self.hass.services.async_call(
+            "persistent_notification",
+            "create",
+            {"title": title, "message": message, "notification_id": notification_id}
+        )
+    
     async def _fetch_user_info(self):
         """Fetch user information from Spotify."""
         try:
-            headers = {"Authorization": f"Bearer {self.access_token}"}
-            async with self.session.get("https://api.spotify.com/v1/me", headers=headers) as resp:
+            async with self.api_session.get("/v1/me", headers=self._auth_headers) as resp:
                 if resp.status != 200:
                     _LOGGER.error(f"Failed to fetch user info: {resp.status}")
                     return False
                 
                 user_info = await resp.json()
-                self.user_id = user_info["id"]
+                self._set_user_id(user_info["id"])
                 _LOGGER.info(f"Spotify authenticated for user: {self.user_id}")
                 return True
-        except Exception as e:
+        except SPOTIFY_ERRORS as e:
             _LOGGER.error(f"Error fetching user info: {e}")
             return False
     
+    @_requires_auth(False)
     async def _create_playlist(self):
         """Create a new playlist for discovered tracks."""
         try:
-            await self.refresh_access_token()
-            if not self.authorized:
-                return False
-            
-            headers = {
-                "Authorization": f"Bearer {self.access_token}",
-                "Content-Type": "application/json",
-            }
-            
             payload = {
                 "name": self.playlist_name,
                 "public": False,
                 "description": "Tracks identified by Home Assistant ACR",
             }
             
-            async with self.session.post(
-                f"https://api.spotify.com/v1/users/{self.user_id}/playlists",
-                headers=headers,
+            async with self.api_session.post(
+                self._url_user_playlists,
+                headers=self._auth_headers_json,
                 json=payload
             ) as resp:
                 if resp.status not in (200, 201):
@@ -278,46 +381,47 @@ class SpotifyService:
                     return False
                 
                 playlist = await resp.json()
-                self.playlist_id = playlist["id"]
+                self._set_playlist_id(playlist["id"])
+                self._playlist_uris = set()
+                self._playlist_snapshot = playlist.get("snapshot_id")
+                self._playlist_etag = None
                 _LOGGER.info(f"Created new Spotify playlist: {self.playlist_name} (ID: {self.playlist_id})")
                 
                 # Show notification
-                await self.hass.services.async_call(
-                    "persistent_notification",
-                    "create",
-                    {
-                        "title": "Spotify Playlist Created",
-                        "message": f"Created new playlist '{self.playlist_name}' for discovered tracks.",
-                        "notification_id": "spotify_playlist_created"
-                    }
+                await self._notify(
+                    "Spotify Playlist Created",
+                    f"Created new playlist '{self.playlist_name}' for discovered tracks.",
+                    "spotify_playlist_created"
                 )
                 
                 return True
-        except Exception as e:
+        except SPOTIFY_ERRORS as e:
             _LOGGER.error(f"Error creating playlist: {e}")
             return False
     
     async def search_track(self, title, artist):
         """Search for a track and return its Spotify URI."""
-        await self.refresh_access_token()
-        if not self.authorized:
-            _LOGGER.error("Not authorized with Spotify")
-            return None, None, None
+        key = (title.casefold(), artist.casefold())
+        cached = self._search_cache.get(key)
+        if cached is not None:
+            expires, result = cached
+            if expires is None or expires > self.hass.loop.time():
+                self._search_cache.move_to_end(key)
+                return result
+            del self._search_cache[key]
         
+        return await self._search_track(key, title, artist)
+    
+    @_requires_auth((None, None, None))
+    async def _search_track(self, key, title, artist):
+        """Search Spotify for a track and cache the result."""
         try:
-            # Format the search query
-            query = f"track:{title} artist:{artist}"
-            query_params = {
-                "q": query,
-                "type": "track",
-                "limit": 1
-            }
+            # Format the search query; only the user supplied part needs quoting
+            query = urllib.parse.quote_plus(f"track:{title} artist:{artist}")
             
-            headers = {"Authorization": f"Bearer {self.access_token}"}
-            
-            async with self.session.get(
-                f"https://api.spotify.com/v1/search?{urllib.parse.urlencode(query_params)}",
-                headers=headers
+            async with self.api_session.get(
+                f"/v1/search?q={query}&type=track&limit=1",
+                headers=self._auth_headers
             ) as resp:
                 if resp.status != 200:
                     _LOGGER.error(f"Failed to search for track: {resp.status}")
@@ -327,72 +431,115 @@ class SpotifyService:
                 
                 if results["tracks"]["items"]:
                     track = results["tracks"]["items"][0]
-                    return track["uri"], track["name"], track["artists"][0]["name"]
+                    result = track["uri"], track["name"], track["artists"][0]["name"]
+                    self._cache_search_result(key, None, result)
+                    return result
                 else:
                     _LOGGER.warning(f"No Spotify track found for: {title} - {artist}")
+                    # The track may be added to Spotify later, so only remember the miss for a while
+                    self._cache_search_result(key, self.hass.loop.time() + SEARCH_MISS_TTL, (None, None, None))
                     return None, None, None
-        except Exception as e:
+        except SPOTIFY_ERRORS as e:
             _LOGGER.error(f"Error searching for track: {e}")
             return None, None, None
     
+    def _cache_search_result(self, key, expires, result):
+        """Remember a search result, evicting the least recently used one when full."""
+        self._search_cache[key] = (expires, result)
+        if len(self._search_cache) > SEARCH_CACHE_SIZE:
+            self._search_cache.popitem(last=False)
+    
+    @_requires_auth(False)
     async def check_track_in_playlist(self, track_uri):
         """Check if the track is already in the playlist."""
-        await self.refresh_access_token()
-        if not self.authorized or not self.playlist_id:
+        if not self.playlist_id:
             return False
         
         try:
-            headers = {"Authorization": f"Bearer {self.access_token}"}
+            # Spotify answers 304 with no body if the playlist still matches the cached URIs' ETag
+            headers = self._auth_headers
+            if self._playlist_uris is not None and self._playlist_etag:
+                headers = {**self._auth_headers, "If-None-Match": self._playlist_etag}
             
-            # First, get the playlist's total tracks
-            async with self.session.get(
-                f"https://api.spotify.com/v1/playlists/{self.playlist_id}",
+            # First, get the playlist's snapshot and total tracks (only those fields, not the full playlist)
+            async with self.api_session.get(
+                self._url_playlist_probe,
                 headers=headers
             ) as resp:
+                if resp.status == 304 and self._playlist_uris is not None:
+                    return track_uri in self._playlist_uris
+                
                 if resp.status != 200:
                     _LOGGER.error(f"Failed to get playlist info: {resp.status}")
                     return False
                 
                 playlist_info = await resp.json()
+                etag = resp.headers.get("ETag")
+                snapshot_id = playlist_info["snapshot_id"]
                 total_tracks = playlist_info["tracks"]["total"]
             
-            # Now check if the track is in the playlist
-            # We might need to make multiple requests for large playlists
-            offset = 0
-            limit = 100
+            # The cached URIs are still valid if the playlist hasn't changed since they were fetched
+            if self._playlist_uris is not None and snapshot_id == self._playlist_snapshot:
+                self._playlist_etag = etag
+                return track_uri in self._playlist_uris
             
-            while offset < total_tracks:
-                params = {
-                    "fields": "items(track(uri))",
-                    "limit": limit,
-                    "offset": offset
-                }
-                
-                async with self.session.get(
-                    f"https://api.spotify.com/v1/playlists/{self.playlist_id}/tracks?{urllib.parse.urlencode(params)}",
-                    headers=headers
-                ) as resp:
-                    if resp.status != 200:
-                        _LOGGER.error(f"Failed to get playlist tracks: {resp.status}")
-                        return False
-                    
-                    tracks_data = await resp.json()
-                    
-                    # Check if the track is in this batch
-                    track_uris = [item["track"]["uri"] for item in tracks_data["items"] if item["track"]]
-                    if track_uri in track_uris:
-                        return True
-                    
-                    offset += limit
+            # Otherwise the playlist has changed, possibly elsewhere (e.g. a recently added track was removed),
+            # so recent adds may be stale and all track URIs are fetched again
+            self._recent_adds.clear()
             
-            # Track not found in playlist
-            return False
-        except Exception as e:
+            # Large playlists need multiple requests, so fetch the pages concurrently
+            semaphore = asyncio.Semaphore(PLAYLIST_PAGE_CONCURRENCY)
+            pages = await asyncio.gather(*(
+                self._fetch_playlist_page(semaphore, offset)
+                for offset in range(0, total_tracks, PLAYLIST_PAGE_SIZE)
+            ), return_exceptions=True)
+            # Every page request has finished by now, so raising the first error leaves none running unawaited
+            for page in pages:
+                if isinstance(page, BaseException):
+                    raise page
+            if None in pages:
+                return False
+            
+            playlist_uris = set()
+            for page in pages:
+                playlist_uris.update(page)
+            
+            self._playlist_uris = playlist_uris
+            self._playlist_snapshot = snapshot_id
+            self._playlist_etag = etag
+            return track_uri in playlist_uris
+        except SPOTIFY_ERRORS as e:
             _LOGGER.error(f"Error checking track in playlist: {e}")
             return False
     
+    async def _fetch_playlist_page(self, semaphore, offset):
+        """Fetch the track URIs on one page of the playlist, or None on failure."""
+        async with semaphore:
+            async with self.api_session.get(
+                f"{self._url_playlist_page}{offset}",
+                headers=self._auth_headers
+            ) as resp:
+                if resp.status != 200:
+                    _LOGGER.error(f"Failed to get playlist tracks: {resp.status}")
+                    return None
+                
+                tracks_data = await resp.json()
+        
+        return [item["track"]["uri"] for item in tracks_data["items"] if item["track"]]
+    
     async def add_track_to_playlist(self, title, artist):
         """Add a track to the specified playlist."""
+        # Repeated requests for the same track (e.g. a double click) need no further lookups
+        key = (title.casefold(), artist.casefold())
+        recent = self._recent_adds.get(key)
+        if recent is not None:
+            expires, (spotify_title, spotify_artist) = recent
+            if expires > self.hass.loop.time():
+                _LOGGER.debug(f"Track already added recently: {title} - {artist}")
+                await self._notify("Spotify Track Already Saved", f"The track '{spotify_title}' by {spotify_artist} is already in your playlist.")
+                return True
+            del self._recent_adds[key]
+        
         if not self.authorized:
             # Show notification for user to authorize
             auth_url = self.get_authorize_url()
@@ -401,15 +548,7 @@ class SpotifyService:
             message = f"Spotify authorization required to add tracks to playlists. " \
                       f"[Click here to authorize]({auth_url})"
             
-            await self.hass.services.async_call(
-                "persistent_notification",
-                "create",
-                {
-                    "title": "Spotify Authorization Required",
-                    "message": message,
-                    "notification_id": "spotify_auth_required"
-                }
-            )
+            await self._notify("Spotify Authorization Required", message, "spotify_auth_required")
             return False
         
         if not self.playlist_id:
@@ -426,15 +565,7 @@ class SpotifyService:
         result = await self.search_track(title, artist)
         if not result or not result[0]:
             # Show notification
-            await self.hass.services.async_call(
-                "persistent_notification",
-                "create",
-                {
-                    "title": "Spotify Track Not Found",
-                    "message": f"Could not find '{title}' by {artist} on Spotify.",
-                    "notification_id": "spotify_track_status"
-                }
-            )
+            await self._notify("Spotify Track Not Found", f"Could not find '{title}' by {artist} on Spotify.")
             return False
         
         track_uri, spotify_title, spotify_artist = result
@@ -442,30 +573,31 @@ class SpotifyService:
         # Check if track is already in playlist
         in_playlist = await self.check_track_in_playlist(track_uri)
         if in_playlist:
+            self._remember_added(key, spotify_title, spotify_artist)
+            
             # Show notification
-            await self.hass.services.async_call(
-                "persistent_notification",
-                "create",
-                {
-                    "title": "Spotify Track Already Saved",
-                    "message": f"The track '{spotify_title}' by {spotify_artist} is already in your playlist.",
-                    "notification_id": "spotify_track_status"
-                }
-            )
+            await self._notify("Spotify Track Already Saved", f"The track '{spotify_title}' by {spotify_artist} is already in your playlist.")
             return True
         
         # Add track to playlist
+        return await self._add_track(track_uri, spotify_title, spotify_artist, key)
+    
+    def _remember_added(self, key, spotify_title, spotify_artist):
+        """Remember a (title, artist) request whose track is in the playlist, evicting the oldest one when full."""
+        self._recent_adds.pop(key, None)
+        self._recent_adds[key] = (self.hass.loop.time() + RECENT_ADDS_TTL, (spotify_title, spotify_artist))
+        if len(self._recent_adds) > RECENT_ADDS_SIZE:
+            self._recent_adds.popitem(last=False)
+    
+    @_requires_auth(False)
+    async def _add_track(self, track_uri, spotify_title, spotify_artist, key):
+        """Add a track to the playlist."""
         try:
-            headers = {
-                "Authorization": f"Bearer {self.access_token}",
-                "Content-Type": "application/json",
-            }
-            
             payload = {"uris": [track_uri]}
             
-            async with self.session.post(
-                f"https://api.spotify.com/v1/playlists/{self.playlist_id}/tracks",
-                headers=headers,
+            async with self.api_session.post(
+                self._url_playlist_tracks,
+                headers=self._auth_headers_json,
                 json=payload
             ) as resp:
                 if resp.status not in (200, 201):
@@ -473,41 +605,26 @@ class SpotifyService:
                     _LOGGER.error(f"Failed to add track to playlist: {resp.status} - {resp_json}")
                     
                     # Show error notification
-                    await self.hass.services.async_call(
-                        "persistent_notification",
-                        "create",
-                        {
-                            "title": "Spotify Error",
-                            "message": f"Failed to add track to playlist: HTTP {resp.status}",
-                            "notification_id": "spotify_track_status"
-                        }
-                    )
+                    await self._notify("Spotify Error", f"Failed to add '{spotify_title}' by {spotify_artist} to playlist: HTTP {resp.status}")
                     return False
                 
+                # Keep the cached URIs current with the playlist's new snapshot
+                if self._playlist_uris is not None:
+                    result = await resp.json()
+                    self._playlist_uris.add(track_uri)
+                    self._playlist_snapshot = result.get("snapshot_id")
+                    self._playlist_etag = None  # Only known from the next playlist response
+                
+                self._remember_added(key, spotify_title, spotify_artist)
+                
                 # Show success notification
-                await self.hass.services.async_call(
-                    "persistent_notification",
-                    "create",
-                    {
-                        "title": "Added Track to Spotify",
-                        "message": f"Successfully added '{spotify_title}' by {spotify_artist} to your Spotify playlist.",
-                        "notification_id": "spotify_track_status"
-                    }
-                )
+                await self._notify("Added Track to Spotify", f"Successfully added '{spotify_title}' by {spotify_artist} to your Spotify playlist.")
                 return True
-        except Exception as e:
+        except SPOTIFY_ERRORS as e:
             _LOGGER.error(f"Error adding track to playlist: {e}")
             
             # Show error notification
-            await self.hass.services.async_call(
-                "persistent_notification",
-                "create",
-                {
-                    "title": "Spotify Error",
-                    "message": f"Failed to add track to playlist: {str(e)}",
-                    "notification_id": "spotify_track_status"
-                }
-            )
+            await self._notify("Spotify Error", f"Failed to add '{spotify_title}' by {spotify_artist} to playlist: {str(e)}")
             return False
 
 async def handle_add_to_spotify(hass, call):
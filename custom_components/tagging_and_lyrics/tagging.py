@@ -1,37 +1,43 @@
-import json
 import logging
 import socket
-import time
 import datetime
-import io
 import re
-import wave
-import threading
+import struct
 import voluptuous as vol
 import asyncio
+from contextlib import asynccontextmanager
+from concurrent.futures import ThreadPoolExecutor
+import orjson
 from homeassistant.core import HomeAssistant, ServiceCall
-from homeassistant.helpers import config_validation as cv
-from homeassistant.helpers.entity_registry import async_get
+from homeassistant.util import dt as dt_util
+from homeassistant.util.json import json_loads
 from acrcloud.recognizer import ACRCloudRecognizer, ACRCloudRecognizeType
 # Import trigger function from lyrics.py
 from .lyrics import trigger_lyrics_lookup, update_lyrics_input_text
+from .const import DOMAIN
 
 # Define whether lyrics lookup should be enabled after tagging
 ENABLE_LYRICS_LOOKUP = True  # Change to False if you don't want automatic lyrics lookup
+# Define whether the full ACRCloud response should also be posted as a notification (useful for debugging)
+ENABLE_FULL_RESULT_NOTIFICATION = True  # Change to False to skip the "Audio Tagging Full Result" notification
 FINETUNE_SYNC = 2 #was 3
 
 _LOGGER = logging.getLogger(__name__)
 
 # Constants
-UDP_PORT = 6056
-CHUNK_SIZE = 4096
 SAMPLE_RATE = 16000
 CHANNELS = 1
 SAMPLE_WIDTH = 2
+UDP_RCVBUF_SIZE = 4 * 1024 * 1024  # Kernel receive buffer to absorb bursts during loop stalls
+UDP_DRAIN_BATCH = 32  # Max datagrams read per readiness wakeup before yielding to other tasks
 
 # New constants for modified approach
 CHUNK_DURATION = 3  # Duration of each audio chunk in seconds
 MAX_TOTAL_DURATION = 12  # Maximum total recording time in seconds
+CHUNK_BYTES = SAMPLE_RATE * SAMPLE_WIDTH * CHANNELS * CHUNK_DURATION  # PCM bytes in one chunk
+
+# Switch on the voice device that streams audio to the UDP port while on
+TAGGING_SWITCH = "switch.home_assistant_voice_093d58_tagging_enable"
 
 # Service Schema
 SERVICE_FETCH_AUDIO_TAG_SCHEMA = vol.Schema({
@@ -39,16 +45,72 @@ SERVICE_FETCH_AUDIO_TAG_SCHEMA = vol.Schema({
     vol.Optional("include_lyrics", default=True): vol.All(vol.Coerce(bool))
 })
 
+# Canonical 44-byte RIFF/WAVE header for 16-bit PCM audio
+_WAV_HEADER = struct.Struct('<4sI4s4sIHHIIHH4sI')
+
+# Precompiled pattern used by clean_text
+_CHINESE_PAT = re.compile(r'[\u4e00-\u9fff]+')
+
 def clean_text(text):
     """Remove Chinese characters from the given text."""
-    return re.sub(r'[\u4e00-\u9fff]+', '', text).strip()
+    if text.isascii():
+        return text.strip()  # Nothing to remove, skip the regex engine
+    return _CHINESE_PAT.sub('', text).strip()
 
     
 def format_time(ms):
     """Convert milliseconds to MM:SS format."""
-    minutes = ms // 60000
-    seconds = (ms % 60000) // 1000
-    return f"{minutes}:{seconds:02d}"
+    minutes, remainder = divmod(ms, 60000)
+    return f"{minutes}:{remainder // 1000:02d}"
+
+def wav_header(data_size):
+    """Build the WAV header for data_size bytes of PCM audio."""
+    return _WAV_HEADER.pack(
+        b'RIFF', 36 + data_size, b'WAVE',
+        b'fmt ', 16, 1, CHANNELS, SAMPLE_RATE,
+        SAMPLE_RATE * CHANNELS * SAMPLE_WIDTH, CHANNELS * SAMPLE_WIDTH, 8 * SAMPLE_WIDTH,
+        b'data', data_size
+    )
+
+def build_wav(pcm):
+    """Wrap PCM audio in a WAV container in memory."""
+    return b"".join((wav_header(len(pcm)), pcm))
+
+def create_udp_socket(port):
+    """Create the non-blocking UDP socket that receives audio samples."""
+    # Create the socket non-blocking in one call where the platform supports it (close-on-exec is the Python default)
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM | getattr(socket, "SOCK_NONBLOCK", 0))
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)  # Allow reuse
+    try:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, UDP_RCVBUF_SIZE)
+    except OSError as e:
+        _LOGGER.warning("Could not enlarge UDP receive buffer: %s", e)
+    _LOGGER.debug("UDP receive buffer is %d bytes (raise net.core.rmem_max if below %d)",
+                  sock.getsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF), UDP_RCVBUF_SIZE)
+    sock.bind(("0.0.0.0", port))
+    if not hasattr(socket, "SOCK_NONBLOCK"):
+        sock.setblocking(False)  # Set to non-blocking
+    return sock
+
+@asynccontextmanager
+async def tagging_switch(hass: HomeAssistant):
+    """Keep the device's tagging switch on for the duration of the block."""
+    turn_on = hass.async_create_task(
+        hass.services.async_call("switch", "turn_on", {"entity_id": TAGGING_SWITCH})
+    )
+
+    async def switch_off():
+        # Don't let turn_off overtake a turn_on that is still being dispatched
+        result, = await asyncio.gather(turn_on, return_exceptions=True)
+        if isinstance(result, Exception):
+            _LOGGER.error("Failed to turn on %s: %s", TAGGING_SWITCH, result)
+        await hass.services.async_call("switch", "turn_off", {"entity_id": TAGGING_SWITCH})
+
+    try:
+        yield
+    finally:
+        # Shielded so the switch is still turned off when the capture is cancelled
+        await asyncio.shield(hass.async_create_task(switch_off()))
 
 class TaggingService:
     """Service to listen for UDP audio samples and process them."""
@@ -60,95 +122,119 @@ class TaggingService:
         else:
             _LOGGER.error("TaggingService initialized WITHOUT hass.")
 
-        conf = hass.data["tagging_and_lyrics"]
+        conf = hass.data[DOMAIN]
 
-        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-        self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)  # Allow reuse
-        self.sock.bind(("0.0.0.0", conf["port"]))
-        self.sock.setblocking(False)  # Set to non-blocking
+        # One instance serves every tagging request, so the socket stays bound between requests
+        self.sock = create_udp_socket(conf["port"])
         self.running = True
+        self._in_flight = False
+        self._audio_buf = bytearray(CHUNK_BYTES)
+        self._stopped = None
 
         _LOGGER.info("Set up UDP on port %d", conf["port"])
 
-        self.config = {
-            'host': conf["host"],
-            'access_key': conf["access_key"],
-            'access_secret': conf["access_secret"],
-            'recognize_type': ACRCloudRecognizeType.ACR_OPT_REC_AUDIO,
-            'debug': False,
-            'timeout': 10
-        }
-        self.recognizer = ACRCloudRecognizer(self.config)
+        # The ACRCloud recognizer is built once at setup and shared by every tagging request
+        self.acrcloud = conf["tagging"]["acrcloud"]
 
     async def receive_udp_data(self, duration):
-        """Non-blocking UDP data reception using asyncio."""
+        """Non-blocking UDP data reception using asyncio, until the chunk is full or the duration has passed."""
         loop = asyncio.get_running_loop()
-        data_buffer = []
+        sock = self.sock
+        fd = sock.fileno()
+        view = memoryview(self._audio_buf)
+        offset = 0
+        stopped = self._stopped = loop.create_future()
+
+        def finish():
+            loop.remove_reader(fd)
+            if not stopped.done():
+                stopped.set_result(None)
+
+        def on_readable():
+            # Drain a batch of queued datagrams on each readiness wakeup, writing straight into the
+            # preallocated chunk buffer; anything left keeps the socket readable for the next loop iteration
+            nonlocal offset
+            for _ in range(UDP_DRAIN_BATCH):
+                try:
+                    offset += sock.recv_into(view[offset:])
+                except BlockingIOError:
+                    return
+                except OSError as e:
+                    _LOGGER.error("Error receiving data: %s", e)
+                    finish()
+                    return
+                if offset == len(view):
+                    # The chunk is complete; later datagrams stay queued for the next one
+                    finish()
+                    return
 
         _LOGGER.info("Recording for %d seconds...", duration)
 
-        start_time = time.time()
-        while time.time() - start_time < duration:
+        loop.add_reader(fd, on_readable)
+        try:
+            await asyncio.wait({stopped}, timeout=duration)
+        finally:
+            # Once stopped, the reader was already removed (and the socket may be closed)
+            if not stopped.done():
+                loop.remove_reader(fd)
+                stopped.cancel()
+
+        return view[:offset]
+
+    def discard_pending_data(self):
+        """Drop datagrams queued on the socket since the previous request."""
+        while True:
             try:
-                data, addr = await loop.sock_recvfrom(self.sock, CHUNK_SIZE)
-                data_buffer.append(data)
-            except BlockingIOError:
-                pass  # No data available yet, continue
-            except Exception as e:
-                _LOGGER.error(f"Error receiving data: {e}")
-                break
-            await asyncio.sleep(0.01)  # Yield control to the event loop
-
-        return data_buffer
+                self.sock.recv_into(self._audio_buf)
+            except OSError:  # BlockingIOError once the queue is empty
+                return
     
-    def _write_audio_file(self, filename, frames):
-        """Write audio data to a WAV file in a blocking way."""
-        with wave.open(filename, "wb") as wf:
-            wf.setnchannels(CHANNELS)
-            wf.setsampwidth(SAMPLE_WIDTH)
-            wf.setframerate(SAMPLE_RATE)
-            wf.writeframes(b"".join(frames))
-    
-    async def write_audio_file(self, filename, frames):
-        """Write audio data to a WAV file in a non-blocking way."""
-        await asyncio.to_thread(self._write_audio_file, filename, frames)
-
-    async def recognize_audio(self, filename):
-        """Recognize audio file using ACRCloud."""
-        return await asyncio.to_thread(self.recognizer.recognize_by_file, filename, 0, CHUNK_DURATION)
-
-    def _set_state_in_loop(self, entity_id, state):
-        """Set state in the Home Assistant event loop."""
-        self.hass.states.async_set(entity_id, state)
+    async def recognize_audio(self, wav_bytes):
+        """Recognize an in-memory WAV chunk using ACRCloud."""
+        return await self.hass.loop.run_in_executor(
+            self.acrcloud["executor"],
+            self.acrcloud["recognizer"].recognize_by_filebuffer,
+            wav_bytes, 0, CHUNK_DURATION
+        )
 
-    async def process_audio_chunk(self, chunk_buffer, chunk_index):
+    async def process_audio_chunk(self, wav_bytes, chunk_index):
         """Process a single audio chunk."""
-        # Convert buffer to WAV file
-        wav_filename = f"recorded_audio_chunk_{chunk_index}.wav"
-        await self.write_audio_file(wav_filename, chunk_buffer)
-        _LOGGER.info(f"Chunk {chunk_index} recording complete. Sending to ACRCloud...")
+        _LOGGER.info("Chunk %d recording complete. Sending to ACRCloud...", chunk_index)
         
         try:
-            response = await self.recognize_audio(wav_filename)
-            _LOGGER.info(f"ACRCloud Response for chunk {chunk_index}: %s", response)
+            response = await self.recognize_audio(wav_bytes)
+            _LOGGER.info("ACRCloud Response for chunk %d: %s", chunk_index, response)
+
+            # Most chunks don't match, and only a match needs the parsed response
+            if '"Success"' not in response:
+                return None, False
             
             # Parse JSON response
-            response_data = json.loads(response)
+            response_data = json_loads(response)
             
-            # Check if we have a successful match
-            if ("status" in response_data and 
-                response_data["status"].get("msg") == "Success" and 
-                "metadata" in response_data and 
-                "music" in response_data["metadata"]):
+            # Check if we have a successful match (with at least one music result)
+            if (response_data.get("status", {}).get("msg") == "Success" and
+                response_data.get("metadata", {}).get("music")):
                 
                 return response_data, True  # Return data and success flag
             
             return response_data, False  # Return data but not successful
             
         except Exception as e:
-            _LOGGER.error(f"Error recognizing chunk {chunk_index}: %s", e)
+            _LOGGER.error("Error recognizing chunk %d: %s", chunk_index, e)
             return None, False
 
+    async def recognize_chunk(self, wav_bytes, chunk_index):
+        """Recognize a recorded chunk in the background, cutting the capture of the next one short on a match."""
+        response_data, is_success = await self.process_audio_chunk(wav_bytes, chunk_index)
+        if not is_success:
+            _LOGGER.info("No match in chunk %d, continuing...", chunk_index)
+            return None
+
+        _LOGGER.info("Successfully recognized audio in chunk %d", chunk_index)
+        self.end_capture()
+        return response_data
+
     async def handle_successful_match(self, response_data, include_lyrics):
         """Handle a successful match from ACRCloud."""
         first_match = response_data["metadata"]["music"][0]  # Get the first match
@@ -160,121 +246,142 @@ class TaggingService:
 
         # Short summary for sensor (title, artist, playtime)
         summary = f"{title} - {artist_name} ({play_time})"
-        self.hass.loop.call_soon_threadsafe(self._set_state_in_loop, "sensor.tagging_result", summary)
-
-        # Full response stored in a persistent notification
-        await self.hass.services.async_call(
-            "persistent_notification",
-            "create",
-            {
-                "title": "Audio Tagging Full Result",
-                "message": f"```json\n{json.dumps(response_data, indent=2)}\n```",
-                "notification_id": "tagging_full_result"
-            }
-        )
-
-        # Formatted response for the main notification
-        message = f"🎵 **Title**: {title}\n👤 **Artist**: {artist_name}\n⏱️ **Play Offset**: {play_time} (MM:SS)"
-
-        await update_lyrics_input_text(self.hass, "", "", "")
-
-        # Create a persistent notification with the formatted response
-        await self.hass.services.async_call(
-            "persistent_notification",
-            "create",
-            {
-                "title": "Audio Tagging Result",
-                "message": message,
-                "notification_id": "tagging_result"
-            }
-        )
+        self.hass.states.async_set("sensor.tagging_result", summary)
 
-        # Trigger lyrics lookup if enabled
+        # Trigger lyrics lookup if enabled; it starts as a background session straight away, so the
+        # lyrics search overlaps the notifications below instead of waiting for them
         if ENABLE_LYRICS_LOOKUP and include_lyrics:
             if title and artist_name:
-                process_begin = datetime.datetime.now(datetime.timezone.utc) - datetime.timedelta(seconds=FINETUNE_SYNC)
+                process_begin = dt_util.utcnow() - datetime.timedelta(seconds=FINETUNE_SYNC)
                 _LOGGER.info("Triggering lyrics lookup for: %s - %s", title, artist_name)
-                await trigger_lyrics_lookup(self.hass, title, artist_name, play_offset_ms, process_begin.isoformat())
+                await trigger_lyrics_lookup(self.hass, title, artist_name, play_offset_ms, process_begin)
+
+        # Formatted response for the main notification
+        message = f"🎵 **Title**: {title}\n👤 **Artist**: {artist_name}\n⏱️ **Play Offset**: {play_time} (MM:SS)"
+
+        # The notifications and clearing the lyrics display are independent, so dispatch them together
+        calls = [
+            update_lyrics_input_text(self.hass, "", "", ""),
+            # Create a persistent notification with the formatted response
+            self.hass.services.async_call(
+                "persistent_notification",
+                "create",
+                {
+                    "title": "Audio Tagging Result",
+                    "message": message,
+                    "notification_id": "tagging_result"
+                }
+            ),
+        ]
+        if ENABLE_FULL_RESULT_NOTIFICATION:
+            # Full response stored in a persistent notification
+            calls.append(self.hass.services.async_call(
+                "persistent_notification",
+                "create",
+                {
+                    "title": "Audio Tagging Full Result",
+                    "message": f"```json\n{orjson.dumps(response_data, option=orjson.OPT_INDENT_2).decode()}\n```",
+                    "notification_id": "tagging_full_result"
+                }
+            ))
+        await asyncio.gather(*calls)
 
     async def listen_for_audio(self, max_duration, include_lyrics):
+        """Listen for UDP audio data, unless a tagging request is already in progress."""
+        if self._in_flight:
+            _LOGGER.warning("Audio tagging is already in progress, ignoring the new request.")
+            return
+
+        self._in_flight = True
+        try:
+            await self._listen_for_audio(max_duration, include_lyrics)
+        finally:
+            self._in_flight = False
+
+    async def _listen_for_audio(self, max_duration, include_lyrics):
         """Listen for UDP audio data in chunks until successful recognition or timeout."""
         try:
             _LOGGER.info("Waiting for incoming UDP audio data...")
             await update_lyrics_input_text(self.hass, "Listening......", "", "")
+
+            # Don't mistake audio left over from the previous request for the start of this one
+            self.discard_pending_data()
             
-            # Turn on the tagging switch
-            await self.hass.services.async_call(
-                "switch", 
-                "turn_on", 
-                {"entity_id": "switch.home_assistant_voice_093d58_tagging_enable"}
-            )
-            
-            total_chunks = max_duration // CHUNK_DURATION
-            all_audio_data = []
-            success = False
-            successful_response = None
+            # The device streams audio while its tagging switch is on; turning it on is dispatched
+            # alongside the first capture rather than ahead of it
+            async with tagging_switch(self.hass):
+                total_chunks = max_duration // CHUNK_DURATION
+                successful_response = None
+                recognition = None  # Recognition of the previous chunk, running while the next one is recorded
             
-            for i in range(total_chunks):
-                _LOGGER.info(f"Recording chunk {i+1}/{total_chunks} ({CHUNK_DURATION} seconds)...")
-                
-                # Collect audio data for this chunk
-                chunk_buffer = await self.receive_udp_data(CHUNK_DURATION)
-                all_audio_data.extend(chunk_buffer)
+                for i in range(total_chunks):
+                    if not self.running:
+                        break
+                    _LOGGER.info("Recording chunk %d/%d (%d seconds)...", i+1, total_chunks, CHUNK_DURATION)
                 
-                # Process this chunk
-                response_data, is_success = await self.process_audio_chunk(chunk_buffer, i+1)
+                    # Collect audio data for this chunk (ends early if the previous chunk is recognized meanwhile)
+                    chunk_buffer = await self.receive_udp_data(CHUNK_DURATION)
+                    if not self.running:
+                        break
+
+                    if recognition is not None:
+                        successful_response = await recognition
+                        if successful_response is not None:
+                            break
                 
-                if is_success:
-                    _LOGGER.info(f"Successfully recognized audio in chunk {i+1}")
-                    success = True
-                    successful_response = response_data
-                    break
+                    # Process this chunk in the background; it is copied into WAV bytes first so the
+                    # buffer can be refilled by the next capture
+                    recognition = self.hass.async_create_task(self.recognize_chunk(build_wav(chunk_buffer), i+1))
                 else:
-                    _LOGGER.info(f"No match in chunk {i+1}, continuing...")
-            
-            # Turn off the tagging switch
-            await self.hass.services.async_call(
-                "switch", 
-                "turn_off", 
-                {"entity_id": "switch.home_assistant_voice_093d58_tagging_enable"}
-            )
-            
+                    if recognition is not None:
+                        successful_response = await recognition
+
+                if not self.running:
+                    # The integration is unloading
+                    if recognition is not None:
+                        recognition.cancel()
+                    _LOGGER.info("Tagging stopped.")
+                    return
+
             # Handle results
-            if success:
+            if successful_response is not None:
                 await self.handle_successful_match(successful_response, include_lyrics)
             else:
                 _LOGGER.info("No music recognized in any chunk.")
-                self.hass.loop.call_soon_threadsafe(self._set_state_in_loop, "sensor.tagging_result", "No match")
+                self.hass.states.async_set("sensor.tagging_result", "No match")
                 
-                # Create a notification for no match
-                await self.hass.services.async_call(
-                    "persistent_notification",
-                    "create",
-                    {
-                        "title": "Audio Tagging Result",
-                        "message": "No music recognized after trying all audio chunks.",
-                        "notification_id": "tagging_result"
-                    }
+                await asyncio.gather(
+                    # Create a notification for no match
+                    self.hass.services.async_call(
+                        "persistent_notification",
+                        "create",
+                        {
+                            "title": "Audio Tagging Result",
+                            "message": "No music recognized after trying all audio chunks.",
+                            "notification_id": "tagging_result"
+                        }
+                    ),
+                    update_lyrics_input_text(self.hass, "", "", ""),
                 )
-                
-                await update_lyrics_input_text(self.hass, "", "", "")
             
             # Make sure switch is off
-            self.hass.loop.call_soon_threadsafe(self._set_state_in_loop, "switch.tag_enable", "off")
+            self.hass.states.async_set("switch.tag_enable", "off")
 
         except Exception as e:
             _LOGGER.error("Error in Tagging Service: %s", e)
             # Ensure switch is turned off in case of an error
-            self.hass.loop.call_soon_threadsafe(self._set_state_in_loop, "switch.tag_enable", "off")
-            await self.hass.services.async_call(
-                "switch", 
-                "turn_off", 
-                {"entity_id": "switch.home_assistant_voice_093d58_tagging_enable"}
-            )
+            self.hass.states.async_set("switch.tag_enable", "off")
+
+    def end_capture(self):
+        """End the capture in progress, if any, keeping the audio received so far."""
+        if self._stopped is not None and not self._stopped.done():
+            self.hass.loop.remove_reader(self.sock.fileno())
+            self._stopped.set_result(None)
 
     def stop(self):
         """Stop the tagging service."""
         self.running = False
+        self.end_capture()
         self.sock.close()
 
 
@@ -286,29 +393,56 @@ async def handle_fetch_audio_tag(hass: HomeAssistant, call: ServiceCall):
     _LOGGER.info("fetch_audio_tag service called. Max recording duration: %s seconds, Lyrics requested: %s", 
                 duration, include_lyrics)
     
-    # Stop any running instance before starting a new one
-    if "tagging_service" in hass.data:
-        _LOGGER.info("Stopping existing tagging service before starting a new one.")
-        hass.data["tagging_service"].stop()
-
-    tagging_service = TaggingService(hass)
-    hass.data["tagging_service"] = tagging_service  # Store the instance
+    # Reuse the long-lived instance, creating it (and binding the UDP port) on first use
+    runtime = hass.data[DOMAIN]["tagging"]
+    if runtime["service"] is None:
+        runtime["service"] = TaggingService(hass)
 
-    await tagging_service.listen_for_audio(duration, include_lyrics)
+    await runtime["service"].listen_for_audio(duration, include_lyrics)
 
 
 async def async_setup_tagging_service(hass: HomeAssistant):
     """Register the fetch_audio_tag service in Home Assistant."""
     _LOGGER.info("Registering the fetch_audio_tag service.")
 
+    conf = hass.data[DOMAIN]
+
+    # Runtime state of the tagging service - the ACRCloud recognizer reused across service calls
+    conf["tagging"] = {
+        "acrcloud": {
+            "recognizer": ACRCloudRecognizer({
+                'host': conf["host"],
+                'access_key': conf["access_key"],
+                'access_secret': conf["access_secret"],
+                'recognize_type': ACRCloudRecognizeType.ACR_OPT_REC_AUDIO,
+                'debug': False,
+                'timeout': 10
+            }),
+            # Recognition gets its own worker so it never queues behind (or starves) Home Assistant's executor
+            "executor": ThreadPoolExecutor(max_workers=1, thread_name_prefix="acrcloud"),
+        },
+        # Tagging service shared by all requests, created on first use
+        "service": None,
+    }
+
     async def async_wrapper(call):
         await handle_fetch_audio_tag(hass, call)
 
     hass.services.async_register(
-        "tagging_and_lyrics",
+        DOMAIN,
         "fetch_audio_tag",
         async_wrapper,
         schema=SERVICE_FETCH_AUDIO_TAG_SCHEMA
     )
 
-    _LOGGER.info("fetch_audio_tag service registered successfully.")
\ No newline at end of file
+    _LOGGER.info("fetch_audio_tag service registered successfully.")
+
+async def async_unload_tagging_service(hass: HomeAssistant):
+    """Stop any running tagging service and remove the fetch_audio_tag service."""
+    runtime = hass.data[DOMAIN].pop("tagging", None)
+    if runtime:
+        if runtime["service"] is not None:
+            runtime["service"].stop()
+        runtime["acrcloud"]["executor"].shutdown(wait=False)
+
+    hass.services.async_remove(DOMAIN, "fetch_audio_tag")